@@ -1,5 +1,5 @@
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Awaitable, Callable
 from app.models.request import LLMProvider, ChatRequest, SearchRequest, SummariseRequest
 from app.models.response import ChatResponse, SearchResponse, SummariseResponse, ErrorResponse
 from app.llm_clients.openai import OpenAIClient
@@ -23,6 +23,17 @@ class LLMController:
         self.search_tool = WebSearchTool()
         self.summariser_tool = SummariserTool()
         self.classifier = QueryClassifier()
+        
+        # Provider calls currently awaiting a response, read by admission control
+        self.pending_provider_calls = 0
+    
+    async def _call_provider(self, call: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Await a provider call while tracking it as pending"""
+        self.pending_provider_calls += 1
+        try:
+            return await call
+        finally:
+            self.pending_provider_calls -= 1
     
     def get_llm_client(self, provider: LLMProvider):
         """Get the appropriate LLM client based on provider"""
@@ -34,13 +45,13 @@ class LLMController:
         
         try:
             client = self.get_llm_client(request.llm_provider)
-            result = await client.chat(
+            result = await self._call_provider(client.chat(
                 query=request.query,
                 context=request.context,
                 conversation_history=request.conversation_history,
                 temperature=request.temperature,
                 max_tokens=request.max_tokens
-            )
+            ))
             
             processing_time = (time.time() - start_time) * 1000
             
@@ -62,26 +73,82 @@ class LLMController:
                 processing_time_ms=processing_time
             )
     
-    async def handle_search(self, request: SearchRequest) -> SearchResponse:
-        """Handle search requests"""
+    async def handle_chat_stream(
+        self,
+        request: ChatRequest,
+        on_token: Callable[[str], Awaitable[None]]
+    ) -> ChatResponse:
+        """Handle chat requests, passing response tokens to on_token as they arrive"""
+        start_time = time.time()
+        
+        try:
+            client = self.get_llm_client(request.llm_provider)
+            chunks = []
+            usage_stats = None
+            
+            self.pending_provider_calls += 1
+            try:
+                async for chunk in client.stream_chat(
+                    query=request.query,
+                    context=request.context,
+                    conversation_history=request.conversation_history,
+                    temperature=request.temperature,
+                    max_tokens=request.max_tokens
+                ):
+                    if chunk.get("delta"):
+                        chunks.append(chunk["delta"])
+                        await on_token(chunk["delta"])
+                    usage_stats = chunk.get("usage_stats", usage_stats)
+            finally:
+                self.pending_provider_calls -= 1
+            
+            processing_time = (time.time() - start_time) * 1000
+            
+            return ChatResponse(
+                success=True,
+                response="".join(chunks),
+                llm_provider=request.llm_provider.value,
+                processing_time_ms=processing_time,
+                usage_stats=usage_stats
+            )
+            
+        except Exception as e:
+            processing_time = (time.time() - start_time) * 1000
+            return ChatResponse(
+                success=False,
+                message=f"Chat processing failed: {str(e)}",
+                response="",
+                llm_provider=request.llm_provider.value,
+                processing_time_ms=processing_time
+            )
+    
+    async def handle_search(
+        self,
+        request: SearchRequest,
+        prefetched_results: Optional[Awaitable[List[Dict[str, Any]]]] = None
+    ) -> SearchResponse:
+        """Handle search requests, optionally reusing an already-started web search"""
         start_time = time.time()
         
         try:
             # Perform web search
             search_results = await self.search_tool.search_with_summary(
                 query=request.query,
-                max_results=request.max_results
+                max_results=request.max_results,
+                prefetched=prefetched_results
             )
             
             # Optionally enhance with LLM if requested
             summary = None
+            usage_stats = None
             if request.include_summary:
                 client = self.get_llm_client(request.llm_provider)
-                llm_result = await client.search(
+                llm_result = await self._call_provider(client.search(
                     query=request.query,
                     context={"search_results": search_results["results"]}
-                )
+                ))
                 summary = llm_result.get("response", search_results["summary"])
+                usage_stats = llm_result.get("usage_stats")
             
             processing_time = (time.time() - start_time) * 1000
             
@@ -98,7 +165,8 @@ class LLMController:
                 search_query=request.query,
                 summary=summary or search_results["summary"],
                 llm_provider=request.llm_provider.value,
-                processing_time_ms=processing_time
+                processing_time_ms=processing_time,
+                usage_stats=usage_stats
             )
             
         except Exception as e:
@@ -127,14 +195,14 @@ class LLMController:
             
             # Enhance with LLM
             client = self.get_llm_client(request.llm_provider)
-            llm_result = await client.summarise(
+            llm_result = await self._call_provider(client.summarise(
                 content=request.content,
                 context={
                     "summary_length": request.summary_length,
                     "summary_style": request.summary_style,
                     "local_summary": local_summary
                 }
-            )
+            ))
             
             processing_time = (time.time() - start_time) * 1000
             
@@ -146,7 +214,8 @@ class LLMController:
                 compression_ratio=local_summary["compression_ratio"],
                 key_points=local_summary.get("key_points"),
                 llm_provider=request.llm_provider.value,
-                processing_time_ms=processing_time
+                processing_time_ms=processing_time,
+                usage_stats=llm_result.get("usage_stats")
             )
             
         except Exception as e:
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Any, List, Optional
+from app.models.request import QueryType, JobRequest, ChatRequest, SearchRequest, SummariseRequest
+from app.models.response import ChatResponse, SummariseResponse
+from app.jobs.store import JobStore
+
+logger = logging.getLogger(__name__)
+
+
+class JobManager:
+    """
+    Runs bulk jobs in the background, off the interactive request path.
+
+    Chat and summarise jobs for clients with `supports_batch` set are
+    submitted as provider batches and polled. Everything else runs through a
+    low-priority lane whose concurrency is capped well below interactive
+    traffic. Progress is persisted after every chunk so queued and running
+    jobs are resumed on startup.
+    """
+
+    def __init__(self, controller, store: Optional[JobStore] = None):
+        self.controller = controller
+        jobs_dir = os.getenv("JOBS_DIR")
+        if store is None and jobs_dir is None:
+            logger.warning(
+                "JOBS_DIR is not set; jobs are stored in /tmp/spotlight-jobs and will not "
+                "survive restarts on Cloud Run. Point JOBS_DIR at a persistent volume."
+            )
+        self.store = store or JobStore(jobs_dir or "/tmp/spotlight-jobs")
+        self.worker_count = int(os.getenv("JOBS_WORKERS", "1"))
+        self.lane_concurrency = int(os.getenv("JOBS_LANE_CONCURRENCY", "2"))
+        self.batch_size = int(os.getenv("JOBS_BATCH_SIZE", "100"))
+        self.poll_interval = float(os.getenv("JOBS_BATCH_POLL_SECONDS", "30"))
+        self.max_items = int(os.getenv("JOBS_MAX_ITEMS", "10000"))
+
+        self.request_models = {
+            QueryType.CHAT: ChatRequest,
+            QueryType.SEARCH: SearchRequest,
+            QueryType.SUMMARISE: SummariseRequest
+        }
+        self.handlers = {
+            QueryType.CHAT: controller.handle_chat,
+            QueryType.SEARCH: controller.handle_search,
+            QueryType.SUMMARISE: controller.handle_summarise
+        }
+
+        self.queue: Optional[asyncio.Queue] = None
+        self.lane: Optional[asyncio.Semaphore] = None
+        self.workers: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Start background workers and requeue unfinished jobs
+        """
+        self.queue = asyncio.Queue()
+        self.lane = asyncio.Semaphore(self.lane_concurrency)
+
+        jobs = await asyncio.to_thread(self.store.list_jobs)
+        for job in sorted(jobs, key=lambda j: j["created_at"]):
+            if job["status"] in ("queued", "running"):
+                self.queue.put_nowait(job["job_id"])
+
+        self.workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+
+    async def stop(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def submit(self, request: JobRequest) -> Dict[str, Any]:
+        """
+        Validate and persist a job, then queue it for the workers
+        """
+        if not request.items:
+            raise ValueError("Job must contain at least one item")
+        if len(request.items) > self.max_items:
+            raise ValueError(f"Job exceeds the maximum of {self.max_items} items")
+
+        # Fail fast on malformed items instead of discovering them mid-job
+        await asyncio.to_thread(self._build_requests, request.job_type, request.llm_provider.value, request.items)
+
+        client = self.controller.get_llm_client(request.llm_provider)
+        use_batch = (
+            request.use_batch_api
+            and getattr(client, "supports_batch", False)
+            # Search jobs must run the web search before any LLM call
+            and request.job_type != QueryType.SEARCH
+        )
+
+        job = await asyncio.to_thread(
+            self.store.create,
+            request.job_type.value,
+            request.llm_provider.value,
+            "batch" if use_batch else "lane",
+            request.items
+        )
+        self.queue.put_nowait(job["job_id"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.load(job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self.queue.get()
+            job = None
+            try:
+                job = await asyncio.to_thread(self.store.load, job_id)
+                if job is None:
+                    continue
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if job is None:
+                    logger.error("Could not load job %s: %s", job_id, e)
+                    continue
+                job["status"] = "failed"
+                job["message"] = f"Job processing failed: {str(e)}"
+                await asyncio.to_thread(self.store.save, job)
+
+    async def _run_job(self, job: Dict[str, Any]) -> None:
+        items = await asyncio.to_thread(self.store.load_items, job["job_id"])
+        finished = await asyncio.to_thread(self.store.finished_items, job["job_id"])
+
+        # Recount from the results file; the record may lag it after a crash
+        job["completed_items"] = sum(1 for success in finished.values() if success)
+        job["failed_items"] = len(finished) - job["completed_items"]
+        job["status"] = "running"
+        await asyncio.to_thread(self.store.save, job)
+
+        job_type = QueryType(job["job_type"])
+        requests = await asyncio.to_thread(self._build_requests, job_type, job["llm_provider"], items)
+
+        if job["mode"] == "batch":
+            await self._run_batches(job, job_type, requests, finished)
+        else:
+            await self._run_lane(job, job_type, requests, finished)
+
+        job["status"] = "completed"
+        await asyncio.to_thread(self.store.save, job)
+
+    async def _run_lane(self, job: Dict[str, Any], job_type: QueryType, requests: List[Any], finished: Dict[int, bool]) -> None:
+        pending = [i for i in range(len(requests)) if i not in finished]
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            responses = await asyncio.gather(
+                *(self._run_in_lane(job_type, requests[i]) for i in chunk)
+            )
+            records = [
+                {
+                    "index": index,
+                    "success": response.success,
+                    "result": response.model_dump(mode="json"),
+                    "error": None if response.success else response.message
+                }
+                for index, response in zip(chunk, responses)
+            ]
+            await self._record(job, records)
+
+    async def _run_in_lane(self, job_type: QueryType, request: Any):
+        async with self.lane:
+            return await self.handlers[job_type](request)
+
+    async def _run_batches(self, job: Dict[str, Any], job_type: QueryType, requests: List[Any], finished: Dict[int, bool]) -> None:
+        client = self.controller.get_llm_client(requests[0].llm_provider)
+        operation = job_type.value
+
+        # Batches submitted before a restart are polled rather than resubmitted
+        in_flight = {i for indices in job["pending_batches"].values() for i in indices}
+        pending = [i for i in range(len(requests)) if i not in finished and i not in in_flight]
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            await self._submit_batch(job, client, operation, requests, chunk)
+
+        while job["pending_batches"]:
+            await asyncio.sleep(self.poll_interval)
+
+            for batch_id, indices in list(job["pending_batches"].items()):
+                batch = await client.get_batch(batch_id)
+                if batch["status"] == "in_progress":
+                    continue
+
+                del job["pending_batches"][batch_id]
+                if batch["status"] == "expired":
+                    await self._submit_batch(job, client, operation, requests, indices)
+                    continue
+
+                if batch["status"] == "completed":
+                    records = [
+                        self._batch_record(job_type, index, requests[index], outcome)
+                        for index, outcome in zip(indices, batch["results"])
+                    ]
+                else:
+                    records = [
+                        {"index": index, "success": False, "result": None, "error": f"Batch {batch['status']}"}
+                        for index in indices
+                    ]
+                await self._record(job, records)
+
+    async def _submit_batch(self, job: Dict[str, Any], client, operation: str, requests: List[Any], indices: List[int]) -> None:
+        batch_items = [self._batch_kwargs(requests[i]) for i in indices]
+        batch_id = await client.submit_batch(operation, batch_items)
+        job["pending_batches"][batch_id] = indices
+        await asyncio.to_thread(self.store.save, job)
+
+    def _batch_kwargs(self, request: Any) -> Dict[str, Any]:
+        """
+        Map a request model onto the keyword arguments of the client method
+        """
+        if isinstance(request, SummariseRequest):
+            return {
+                "content": request.content,
+                "context": {
+                    "summary_length": request.summary_length,
+                    "summary_style": request.summary_style
+                }
+            }
+        return {
+            "query": request.query,
+            "context": request.context,
+            "conversation_history": request.conversation_history,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens
+        }
+
+    def _batch_record(self, job_type: QueryType, index: int, request: Any, outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert a raw batch outcome into the same record shape the lane produces
+        """
+        if outcome["error"] is not None:
+            return {"index": index, "success": False, "result": None, "error": outcome["error"]}
+
+        result = outcome["result"]
+        if job_type == QueryType.SUMMARISE:
+            local_summary = self.controller.summariser_tool.summarise_content(
+                content=request.content,
+                length=request.summary_length,
+                style=request.summary_style
+            )
+            summary = result.get("summary", local_summary["summary"])
+            response = SummariseResponse(
+                success=True,
+                summary=summary,
+                original_length=len(request.content),
+                summary_length=len(summary),
+                compression_ratio=local_summary["compression_ratio"],
+                key_points=local_summary.get("key_points"),
+                llm_provider=request.llm_provider.value,
+                usage_stats=result.get("usage_stats")
+            )
+        else:
+            response = ChatResponse(
+                success=True,
+                response=result["response"],
+                llm_provider=request.llm_provider.value,
+                usage_stats=result.get("usage_stats")
+            )
+
+        return {"index": index, "success": True, "result": response.model_dump(mode="json"), "error": None}
+
+    async def _record(self, job: Dict[str, Any], records: List[Dict[str, Any]]) -> None:
+        await asyncio.to_thread(self.store.append_results, job["job_id"], records)
+        succeeded = sum(1 for record in records if record["success"])
+        job["completed_items"] += succeeded
+        job["failed_items"] += len(records) - succeeded
+        await asyncio.to_thread(self.store.save, job)
+
+    def _build_requests(self, job_type: QueryType, llm_provider: str, items: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Validate items into request models; run in a thread, as large jobs take a while
+        """
+        model = self.request_models[job_type]
+        return [model(**{**item, "llm_provider": llm_provider}) for item in items]
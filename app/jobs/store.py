@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class JobStore:
+    """
+    File-backed persistence for bulk jobs.
+
+    Each job is kept as three files in the jobs directory:
+    `<id>.json` (status and counters), `<id>.items.json` (submitted items)
+    and `<id>.results.jsonl` (one line per finished item), so progress
+    survives restarts and results can be streamed without loading them.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, job_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{job_id}{suffix}")
+
+    def create(self, job_type: str, llm_provider: str, mode: str, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Persist a new queued job and return its record
+        """
+        now = datetime.now().isoformat()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "job_type": job_type,
+            "llm_provider": llm_provider,
+            "mode": mode,
+            "total_items": len(items),
+            "completed_items": 0,
+            "failed_items": 0,
+            "pending_batches": {},
+            "message": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        self._write_json(self._path(job["job_id"], ".items.json"), items)
+        self.save(job)
+        return job
+
+    def save(self, job: Dict[str, Any]) -> None:
+        """
+        Atomically write the job record
+        """
+        job["updated_at"] = datetime.now().isoformat()
+        self._write_json(self._path(job["job_id"], ".json"), job)
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(job_id, ".json")
+        # Job ids are generated hex strings; refuse anything that could escape the directory
+        if not job_id.isalnum() or not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def load_items(self, job_id: str) -> List[Dict[str, Any]]:
+        with open(self._path(job_id, ".items.json")) as f:
+            return json.load(f)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        jobs = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and not name.endswith(".items.json"):
+                try:
+                    job = self.load(name[:-len(".json")])
+                except (OSError, ValueError) as e:
+                    # A torn or unreadable record must not stop the others from loading
+                    logger.warning("Skipping unreadable job record %s: %s", name, e)
+                    continue
+                if job:
+                    jobs.append(job)
+        return jobs
+
+    def append_results(self, job_id: str, records: List[Dict[str, Any]]) -> None:
+        """
+        Append finished item records to the job's results file
+        """
+        with open(self._path(job_id, ".results.jsonl"), "a") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def finished_items(self, job_id: str) -> Dict[int, bool]:
+        """
+        Map of item index to success for items that already have a result line
+        """
+        finished = {}
+        for line in self.iter_results(job_id):
+            try:
+                record = json.loads(line)
+                finished[record["index"]] = record["success"]
+            except (ValueError, KeyError):
+                continue
+        return finished
+
+    def iter_results(self, job_id: str) -> Iterator[str]:
+        path = self._path(job_id, ".results.jsonl")
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                # Skip a torn trailing line left by a crash mid-write; that item is rerun
+                if line.endswith("\n"):
+                    yield line
+
+    def _write_json(self, path: str, data: Any) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_path, path)
@@ -1,6 +1,8 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import anthropic
+from app.llm_clients.batch import LocalBatchBackend
+from app.llm_clients.tokens import TokenBudget
 
 
 class AnthropicClient:
@@ -11,43 +13,83 @@ class AnthropicClient:
         else:
             self.client = None
         self.model = os.getenv("ANTHROPIC_MODEL", "claude-3-sonnet-20240229")
+        self.token_budget = TokenBudget("anthropic", self.model)
+        # No provider batch API is wired in yet; the in-process stub is only for tests
+        self.supports_batch = os.getenv("JOBS_LOCAL_BATCH_STUB", "false").lower() == "true"
+        self.batch_backend = LocalBatchBackend(self)
     
     async def chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle chat completion using Anthropic Claude
         """
-        # TODO: Implement actual Anthropic chat logic
+        conversation_history, usage_stats = self.token_budget.prepare_chat(
+            query, kwargs.get("conversation_history")
+        )
+        
+        # TODO: Implement actual Anthropic chat logic with the trimmed conversation_history
         if self.client is None:
             return {
                 "response": f"Anthropic chat response for: {query} (mock - no API key)",
                 "provider": "anthropic",
-                "model": self.model
+                "model": self.model,
+                "usage_stats": usage_stats
             }
         
         return {
             "response": f"Anthropic chat response for: {query}",
             "provider": "anthropic",
-            "model": self.model
+            "model": self.model,
+            "usage_stats": usage_stats
         }
     
+    async def stream_chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from Anthropic as response deltas, ending with usage stats
+        """
+        # TODO: Stream from the Anthropic API (stream=True); until then the full response is split into deltas
+        result = await self.chat(query, context=context, **kwargs)
+        for i, word in enumerate(result["response"].split(" ")):
+            yield {"delta": word if i == 0 else " " + word}
+        yield {"delta": "", "usage_stats": result.get("usage_stats")}
+    
     async def search(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle search-based queries using Anthropic
         """
-        # TODO: Implement search logic with Anthropic
+        context, usage_stats = self.token_budget.prepare_search(query, context)
+        
+        # TODO: Implement search logic with Anthropic using the trimmed context
         return {
             "response": f"Anthropic search response for: {query}",
             "provider": "anthropic",
-            "model": self.model
+            "model": self.model,
+            "usage_stats": usage_stats
         }
     
     async def summarise(self, content: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle summarisation using Anthropic
         """
+        usage_stats = self.token_budget.prepare_summarise(content)
+        
         # TODO: Implement summarisation logic
         return {
             "summary": f"Anthropic summary of content: {content[:100]}...",
             "provider": "anthropic",
-            "model": self.model
-        } 
\ No newline at end of file
+            "model": self.model,
+            "usage_stats": usage_stats
+        }
+    
+    async def submit_batch(self, operation: str, items: List[Dict[str, Any]]) -> str:
+        """
+        Submit a batch of chat/search/summarise calls using the Anthropic Message Batches API
+        """
+        # TODO: Submit to the Anthropic Message Batches API once the SDK is upgraded
+        return await self.batch_backend.submit(operation, items)
+    
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Poll a submitted batch, returning its status and ordered results
+        """
+        # TODO: Poll the Anthropic Message Batches API once the SDK is upgraded
+        return await self.batch_backend.retrieve(batch_id)
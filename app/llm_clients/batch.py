@@ -0,0 +1,51 @@
+import asyncio
+import uuid
+from typing import Dict, Any, List
+
+
+class LocalBatchBackend:
+    """
+    In-process stand-in for provider batch APIs.
+
+    Mirrors the submit/poll shape of the OpenAI and Anthropic batch endpoints
+    by running each item through the owning client's own methods. It is a
+    test stand-in enabled with JOBS_LOCAL_BATCH_STUB, not a production path:
+    items run on the serving event loop outside the job lane. Batches only
+    live in memory, so a batch id unknown after a restart is reported as
+    expired and the job manager resubmits the affected items.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self._batches: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, operation: str, items: List[Dict[str, Any]]) -> str:
+        """
+        Start a batch of `operation` calls and return its batch id
+        """
+        batch_id = f"localbatch-{uuid.uuid4().hex}"
+        self._batches[batch_id] = asyncio.create_task(self._run(operation, items))
+        return batch_id
+
+    async def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Return the batch status and, once completed, its ordered results
+        """
+        task = self._batches.get(batch_id)
+        if task is None:
+            return {"status": "expired", "results": []}
+        if not task.done():
+            return {"status": "in_progress", "results": []}
+
+        del self._batches[batch_id]
+        return {"status": "completed", "results": task.result()}
+
+    async def _run(self, operation: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        method = getattr(self.client, operation)
+        results = []
+        for item in items:
+            try:
+                results.append({"result": await method(**item), "error": None})
+            except Exception as e:
+                results.append({"result": None, "error": str(e)})
+        return results
@@ -1,6 +1,7 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator
 import google.generativeai as genai
+from app.llm_clients.tokens import TokenBudget
 
 
 class GeminiClient:
@@ -15,43 +16,68 @@ class GeminiClient:
             self.client = None
             self.model_name = os.getenv("GEMINI_MODEL", "gemini-pro")
             self.model = None
+        self.token_budget = TokenBudget("gemini", self.model_name)
+        # No batch API in this SDK version; bulk jobs use the low-priority lane
+        self.supports_batch = False
     
     async def chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle chat completion using Google Gemini
         """
-        # TODO: Implement actual Gemini chat logic
+        conversation_history, usage_stats = self.token_budget.prepare_chat(
+            query, kwargs.get("conversation_history")
+        )
+        
+        # TODO: Implement actual Gemini chat logic with the trimmed conversation_history
         if self.client is None:
             return {
                 "response": f"Gemini chat response for: {query} (mock - no API key)",
                 "provider": "gemini",
-                "model": self.model_name
+                "model": self.model_name,
+                "usage_stats": usage_stats
             }
         
         return {
             "response": f"Gemini chat response for: {query}",
             "provider": "gemini",
-            "model": self.model_name
+            "model": self.model_name,
+            "usage_stats": usage_stats
         }
     
+    async def stream_chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from Gemini as response deltas, ending with usage stats
+        """
+        # TODO: Stream from the Gemini API (stream=True); until then the full response is split into deltas
+        result = await self.chat(query, context=context, **kwargs)
+        for i, word in enumerate(result["response"].split(" ")):
+            yield {"delta": word if i == 0 else " " + word}
+        yield {"delta": "", "usage_stats": result.get("usage_stats")}
+    
     async def search(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle search-based queries using Gemini
         """
-        # TODO: Implement search logic with Gemini
+        context, usage_stats = self.token_budget.prepare_search(query, context)
+        
+        # TODO: Implement search logic with Gemini using the trimmed context
         return {
             "response": f"Gemini search response for: {query}",
             "provider": "gemini",
-            "model": self.model_name
+            "model": self.model_name,
+            "usage_stats": usage_stats
         }
     
     async def summarise(self, content: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle summarisation using Gemini
         """
+        usage_stats = self.token_budget.prepare_summarise(content)
+        
         # TODO: Implement summarisation logic
         return {
             "summary": f"Gemini summary of content: {content[:100]}...",
             "provider": "gemini",
-            "model": self.model_name
+            "model": self.model_name,
+            "usage_stats": usage_stats
         } 
\ No newline at end of file
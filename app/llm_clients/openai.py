@@ -1,7 +1,9 @@
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
 import openai
 from openai import OpenAI
+from app.llm_clients.batch import LocalBatchBackend
+from app.llm_clients.tokens import TokenBudget
 
 
 class OpenAIClient:
@@ -12,43 +14,83 @@ class OpenAIClient:
         else:
             self.client = None
         self.model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        self.token_budget = TokenBudget("openai", self.model)
+        # No provider batch API is wired in yet; the in-process stub is only for tests
+        self.supports_batch = os.getenv("JOBS_LOCAL_BATCH_STUB", "false").lower() == "true"
+        self.batch_backend = LocalBatchBackend(self)
     
     async def chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle chat completion using OpenAI API
         """
-        # TODO: Implement actual OpenAI chat logic
+        conversation_history, usage_stats = self.token_budget.prepare_chat(
+            query, kwargs.get("conversation_history")
+        )
+        
+        # TODO: Implement actual OpenAI chat logic with the trimmed conversation_history
         if self.client is None:
             return {
                 "response": f"OpenAI chat response for: {query} (mock - no API key)",
                 "provider": "openai",
-                "model": self.model
+                "model": self.model,
+                "usage_stats": usage_stats
             }
         
         return {
             "response": f"OpenAI chat response for: {query}",
             "provider": "openai",
-            "model": self.model
+            "model": self.model,
+            "usage_stats": usage_stats
         }
     
+    async def stream_chat(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from OpenAI as response deltas, ending with usage stats
+        """
+        # TODO: Stream from the OpenAI API (stream=True); until then the full response is split into deltas
+        result = await self.chat(query, context=context, **kwargs)
+        for i, word in enumerate(result["response"].split(" ")):
+            yield {"delta": word if i == 0 else " " + word}
+        yield {"delta": "", "usage_stats": result.get("usage_stats")}
+    
     async def search(self, query: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle search-based queries using OpenAI
         """
-        # TODO: Implement search logic with OpenAI
+        context, usage_stats = self.token_budget.prepare_search(query, context)
+        
+        # TODO: Implement search logic with OpenAI using the trimmed context
         return {
             "response": f"OpenAI search response for: {query}",
             "provider": "openai",
-            "model": self.model
+            "model": self.model,
+            "usage_stats": usage_stats
         }
     
     async def summarise(self, content: str, context: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Handle summarisation using OpenAI
         """
+        usage_stats = self.token_budget.prepare_summarise(content)
+        
         # TODO: Implement summarisation logic
         return {
             "summary": f"OpenAI summary of content: {content[:100]}...",
             "provider": "openai",
-            "model": self.model
-        } 
\ No newline at end of file
+            "model": self.model,
+            "usage_stats": usage_stats
+        }
+    
+    async def submit_batch(self, operation: str, items: List[Dict[str, Any]]) -> str:
+        """
+        Submit a batch of chat/search/summarise calls using the OpenAI Batch API
+        """
+        # TODO: Submit to the OpenAI Batch API once the SDK is upgraded
+        return await self.batch_backend.submit(operation, items)
+    
+    async def get_batch(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Poll a submitted batch, returning its status and ordered results
+        """
+        # TODO: Poll the OpenAI Batch API once the SDK is upgraded
+        return await self.batch_backend.retrieve(batch_id)
@@ -0,0 +1,200 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+
+# tiktoken is optional and not part of the pinned dependencies; without it
+# every provider uses the character-based approximation
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+# Per-message framing overhead used by chat formats (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Tokenizer counts keyed by a digest of the text, so cached entries do not keep
+# whole documents alive
+COUNT_CACHE_SIZE = 8192
+_token_counts: "OrderedDict[Tuple[str, str, bytes], int]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def _get_encoder(provider: str, model: str):
+    """
+    Load and cache the tokenizer for a provider/model, or None to approximate
+    """
+    # Only OpenAI publishes a local tokenizer; other providers are approximated
+    if provider != "openai" or tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _count_tokens(provider: str, model: str, text: str) -> int:
+    encoder = _get_encoder(provider, model)
+    if encoder is None:
+        # Roughly four characters per token for English text; cheap enough not to cache
+        return (len(text) + 3) // 4
+
+    key = (provider, model, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    count = _token_counts.get(key)
+    if count is not None:
+        _token_counts.move_to_end(key)
+        return count
+
+    count = len(encoder.encode(text))
+    _token_counts[key] = count
+    if len(_token_counts) > COUNT_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+    return count
+
+
+class TokenBudget:
+    """
+    Measures and trims prompt material to a token budget before provider calls.
+
+    Tokenizer counts are cached per provider, model and text digest, so
+    re-sending a conversation only tokenizes messages that have not been seen
+    before. Unless tiktoken is installed, counts are approximations.
+    """
+
+    def __init__(self, provider: str, model: str):
+        self.provider = provider
+        self.model = model
+        self.history_budget = int(os.getenv("HISTORY_TOKEN_BUDGET", "3000"))
+        self.search_context_budget = int(os.getenv("SEARCH_CONTEXT_TOKEN_BUDGET", "2000"))
+
+    def count(self, text: Optional[str]) -> int:
+        if not text:
+            return 0
+        return _count_tokens(self.provider, self.model, text)
+
+    def count_message(self, message: Dict[str, str]) -> int:
+        return MESSAGE_OVERHEAD_TOKENS + self.count(message.get("role")) + self.count(message.get("content"))
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        return sum(self.count_message(message) for message in messages)
+
+    def trim_text(self, text: str, budget: int) -> str:
+        """
+        Cut text down to at most `budget` tokens
+        """
+        if self.count(text) <= budget:
+            return text
+        encoder = _get_encoder(self.provider, self.model)
+        if encoder is None:
+            return text[:budget * 4]
+        return encoder.decode(encoder.encode(text)[:budget])
+
+    def trim_history(self, history: List[Dict[str, str]], budget: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Keep the most recent messages that fit within the history budget,
+        shortening the newest one if it alone is over budget
+        """
+        budget = self.history_budget if budget is None else budget
+        kept = []
+        used = 0
+        for message in reversed(history):
+            tokens = self.count_message(message)
+            if used + tokens > budget:
+                if not kept:
+                    content_budget = budget - MESSAGE_OVERHEAD_TOKENS - self.count(message.get("role"))
+                    if content_budget > 0:
+                        kept.append({**message, "content": self.trim_text(message.get("content") or "", content_budget)})
+                break
+            kept.append(message)
+            used += tokens
+        kept.reverse()
+        return kept
+
+    def trim_search_results(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        budget: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank results by relevance to the query and keep those that fit the budget
+        """
+        budget = self.search_context_budget if budget is None else budget
+        query_terms = set(re.findall(r"\w+", query.lower()))
+
+        def relevance(result: Dict[str, Any]) -> float:
+            text = f"{result.get('title', '')} {result.get('snippet', '')}".lower()
+            overlap = len(query_terms & set(re.findall(r"\w+", text))) / len(query_terms) if query_terms else 0.0
+            return (result.get("relevance_score") or 0.0) + overlap
+
+        kept = []
+        used = 0
+        for result in sorted(results, key=relevance, reverse=True):
+            tokens = self._result_tokens(result)
+            if used + tokens > budget:
+                continue
+            kept.append(result)
+            used += tokens
+
+        # Never send an empty context just because the best result is long
+        if not kept and results:
+            best = max(results, key=relevance)
+            kept = [{**best, "snippet": self.trim_text(best.get("snippet", ""), budget)}]
+        return kept
+
+    def prepare_chat(
+        self,
+        query: str,
+        conversation_history: Optional[List[Dict[str, str]]]
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Trim history for a chat call and return it with its usage stats
+        """
+        history = conversation_history or []
+        trimmed = self.trim_history(history)
+        usage_stats = {
+            "prompt_tokens": self.count(query) + self.count_messages(trimmed),
+            "history_messages": len(trimmed),
+            "history_messages_dropped": len(history) - len(trimmed),
+            "token_count_method": self.method
+        }
+        return trimmed, usage_stats
+
+    def prepare_search(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Trim search results in the context and return it with its usage stats
+        """
+        results = (context or {}).get("search_results") or []
+        trimmed = self.trim_search_results(query, results)
+        if context is not None:
+            context = {**context, "search_results": trimmed}
+        usage_stats = {
+            "prompt_tokens": self.count(query) + sum(self._result_tokens(result) for result in trimmed),
+            "search_results": len(trimmed),
+            "search_results_dropped": len(results) - len(trimmed),
+            "token_count_method": self.method
+        }
+        return context, usage_stats
+
+    def prepare_summarise(self, content: str) -> Dict[str, Any]:
+        """
+        Usage stats for a summarisation call
+        """
+        return {
+            "prompt_tokens": self.count(content),
+            "token_count_method": self.method
+        }
+
+    @property
+    def method(self) -> str:
+        return "tokenizer" if _get_encoder(self.provider, self.model) is not None else "approximate"
+
+    def _result_tokens(self, result: Dict[str, Any]) -> int:
+        return self.count(result.get("title")) + self.count(result.get("snippet")) + self.count(result.get("url"))
@@ -2,7 +2,9 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from app.router import router
+from app.router import router, job_manager, admission, loop_block_detector
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.allocations import AllocationTracingMiddleware
 
 # Load environment variables
 load_dotenv()
@@ -16,6 +18,12 @@ app = FastAPI(
     redoc_url="/redoc" if os.getenv("ENVIRONMENT") != "production" else None,
 )
 
+# Opt-in per-request allocation tracing for admins
+app.add_middleware(AllocationTracingMiddleware)
+
+# Shed load early under overload; added before CORS so rejections still carry CORS headers
+app.add_middleware(AdmissionControlMiddleware, admission=admission)
+
 # Configure CORS for frontend access
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +36,33 @@ app.add_middleware(
 # Include the router
 app.include_router(router, prefix="/api/v1")
 
+# Background workers for bulk jobs
+@app.on_event("startup")
+async def start_job_manager():
+    await job_manager.start()
+
+@app.on_event("shutdown")
+async def stop_job_manager():
+    await job_manager.stop()
+
+# Measure event-loop lag for admission control
+@app.on_event("startup")
+async def start_admission_lag_monitor():
+    admission.start_lag_monitor()
+
+@app.on_event("shutdown")
+async def stop_admission_lag_monitor():
+    await admission.stop_lag_monitor()
+
+# Log event-loop stalls with the stack that caused them
+@app.on_event("startup")
+async def start_loop_block_detector():
+    loop_block_detector.start()
+
+@app.on_event("shutdown")
+async def stop_loop_block_detector():
+    await loop_block_detector.stop()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -40,7 +75,8 @@ async def root():
             "search": "/api/v1/search", 
             "summarise": "/api/v1/summarise",
             "auto": "/api/v1/auto",
-            "classify": "/api/v1/classify"
+            "classify": "/api/v1/classify",
+            "jobs": "/api/v1/jobs"
         }
     }
 
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import time
+from enum import IntEnum
+from typing import Dict, Any, Optional, Tuple
+from starlette.responses import JSONResponse
+
+
+class RoutePriority(IntEnum):
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+    CRITICAL = 3
+
+
+# Longest matching prefix wins; unlisted routes share the NORMAL "other" bucket
+ROUTE_PRIORITIES = {
+    "/health": RoutePriority.CRITICAL,
+    "/api/v1/health": RoutePriority.CRITICAL,
+    "/api/v1/admin": RoutePriority.CRITICAL,
+    "/api/v1/chat": RoutePriority.HIGH,
+    "/api/v1/search": RoutePriority.NORMAL,
+    "/api/v1/auto": RoutePriority.NORMAL,
+    "/api/v1/classify": RoutePriority.NORMAL,
+    "/api/v1/summarise": RoutePriority.LOW,
+    "/api/v1/jobs": RoutePriority.LOW
+}
+
+# Fraction of each limit a priority may use, so lower priorities are shed first
+PRIORITY_SHARES = {
+    RoutePriority.LOW: 0.5,
+    RoutePriority.NORMAL: 0.75,
+    RoutePriority.HIGH: 1.0
+}
+
+
+class AdmissionController:
+    """
+    Decides whether to admit a request based on current load.
+
+    Requests are rejected early when event-loop lag, per-route in-flight
+    requests or pending provider calls exceed their limits, scaled down for
+    lower-priority routes. When the global concurrency limit is reached,
+    requests wait in a queue managed CoDel-style: if queueing delay has stayed
+    above the target for a whole interval, new arrivals are rejected
+    immediately instead of queueing, until the queue drains again. CoDel state
+    is kept per priority, since each priority queues against its own limit.
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+        self.max_loop_lag = float(os.getenv("ADMISSION_MAX_LOOP_LAG_MS", "200")) / 1000
+        self.max_concurrency = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+        self.max_route_in_flight = int(os.getenv("ADMISSION_MAX_ROUTE_IN_FLIGHT", "32"))
+        self.max_pending_provider_calls = int(os.getenv("ADMISSION_MAX_PENDING_PROVIDER_CALLS", "48"))
+        self.queue_timeout = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "1000")) / 1000
+        self.codel_target = float(os.getenv("ADMISSION_CODEL_TARGET_MS", "50")) / 1000
+        self.codel_interval = float(os.getenv("ADMISSION_CODEL_INTERVAL_MS", "500")) / 1000
+        self.retry_after = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+        self.lag_probe_interval = 0.1
+
+        self.loop_lag = 0.0
+        self.in_flight = 0
+        self.route_in_flight: Dict[str, int] = {}
+        self.slot_released = asyncio.Condition()
+        self.first_above_time: Dict[RoutePriority, float] = {priority: 0.0 for priority in PRIORITY_SHARES}
+        self.dropping: Dict[RoutePriority, bool] = {priority: False for priority in PRIORITY_SHARES}
+        self.lag_monitor: Optional[asyncio.Task] = None
+        self.rejected: Dict[str, int] = {}
+
+    def start_lag_monitor(self) -> None:
+        self.loop_lag = 0.0
+        self.lag_monitor = asyncio.create_task(self._monitor_loop_lag())
+
+    async def stop_lag_monitor(self) -> None:
+        if self.lag_monitor is not None:
+            self.lag_monitor.cancel()
+            await asyncio.gather(self.lag_monitor, return_exceptions=True)
+            self.lag_monitor = None
+
+    async def _monitor_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(self.lag_probe_interval)
+            lag = max(loop.time() - scheduled - self.lag_probe_interval, 0.0)
+            # Hold spikes briefly and decay, so one fast tick does not hide an overload
+            self.loop_lag = max(lag, self.loop_lag * 0.5)
+
+    def classify_route(self, path: str) -> Tuple[str, RoutePriority]:
+        matches = [prefix for prefix in ROUTE_PRIORITIES if path == prefix or path.startswith(prefix + "/")]
+        if not matches:
+            # One shared bucket, so unknown and scanner paths cannot grow route_in_flight
+            return "other", RoutePriority.NORMAL
+        route = max(matches, key=len)
+        return route, ROUTE_PRIORITIES[route]
+
+    async def admit(self, route: str, priority: RoutePriority) -> Optional[str]:
+        """
+        Reserve a slot for the request, or return the reason it was rejected
+        """
+        share = PRIORITY_SHARES[priority]
+
+        if self.loop_lag > self.max_loop_lag * share:
+            return self._reject("event_loop_lag")
+        if self.controller.pending_provider_calls >= self.max_pending_provider_calls * share:
+            return self._reject("provider_backlog")
+        if self.route_in_flight.get(route, 0) >= self.max_route_in_flight * share:
+            return self._reject("route_limit")
+
+        limit = self.max_concurrency * share
+        if self.in_flight >= limit:
+            if self.dropping[priority]:
+                return self._reject("queue_dropping")
+
+            enqueued = time.monotonic()
+            try:
+                async with self.slot_released:
+                    await asyncio.wait_for(
+                        self.slot_released.wait_for(lambda: self.in_flight < limit),
+                        self.queue_timeout
+                    )
+            except asyncio.TimeoutError:
+                self._observe_sojourn(priority, time.monotonic() - enqueued)
+                return self._reject("queue_timeout")
+            self._observe_sojourn(priority, time.monotonic() - enqueued)
+        else:
+            # Admitted under this priority's own limit: its queue is empty
+            self._observe_sojourn(priority, 0.0)
+
+        self.in_flight += 1
+        self.route_in_flight[route] = self.route_in_flight.get(route, 0) + 1
+        return None
+
+    async def release(self, route: str) -> None:
+        self.in_flight -= 1
+        self.route_in_flight[route] -= 1
+        # Waiters have different limits per priority, so wake them all to re-check
+        async with self.slot_released:
+            self.slot_released.notify_all()
+
+    def _observe_sojourn(self, priority: RoutePriority, sojourn: float) -> None:
+        """
+        CoDel state update for a priority from the time a request spent queued
+        """
+        now = time.monotonic()
+        if sojourn < self.codel_target:
+            self.first_above_time[priority] = 0.0
+            self.dropping[priority] = False
+        elif self.first_above_time[priority] == 0.0:
+            self.first_above_time[priority] = now + self.codel_interval
+        elif now >= self.first_above_time[priority]:
+            self.dropping[priority] = True
+
+    def _reject(self, reason: str) -> str:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return reason
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "loop_lag_ms": self.loop_lag * 1000,
+            "in_flight": self.in_flight,
+            "route_in_flight": dict(self.route_in_flight),
+            "pending_provider_calls": self.controller.pending_provider_calls,
+            "dropping": {priority.name.lower(): dropping for priority, dropping in self.dropping.items()},
+            "rejected": dict(self.rejected)
+        }
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load with 503 and Retry-After before routing
+    """
+
+    def __init__(self, app, admission: AdmissionController):
+        self.app = app
+        self.admission = admission
+
+    async def __call__(self, scope, receive, send):
+        # Websocket sessions admit each operation themselves; lifespan events pass through
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route, priority = self.admission.classify_route(scope["path"])
+        if priority == RoutePriority.CRITICAL:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self.admission.admit(route, priority)
+        if reason is not None:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": f"Server overloaded ({reason}), retry later"},
+                headers={"Retry-After": str(self.admission.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.admission.release(route)
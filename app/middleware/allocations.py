@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import os
+import threading
+import tracemalloc
+from app.utils.admin import verify_admin_token
+
+logger = logging.getLogger(__name__)
+
+
+class AllocationTracingMiddleware:
+    """
+    Traces memory allocations for a single request on demand.
+
+    Requests carrying `X-Trace-Allocations: 1` and a valid `X-Admin-Token`
+    are run under tracemalloc. The allocations made up to the start of the
+    response are summarised in the `X-Allocated-Bytes` header and the top
+    allocation sites are logged. Snapshots and their diff are computed in a
+    worker thread so tracing does not stall the event loop. Only one request
+    is traced at a time, and other requests run concurrently, so figures are
+    indicative rather than exact.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.top_n = int(os.getenv("ALLOCATION_TRACE_TOP_N", "15"))
+        self.lock = threading.Lock()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if headers.get(b"x-trace-allocations") != b"1" or not verify_admin_token(
+            headers.get(b"x-admin-token", b"").decode("latin-1")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        # A trace is already running; serve this request untraced
+        if not self.lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        before = None
+        reported = False
+
+        def diff_allocations():
+            stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+            allocated = sum(stat.size_diff for stat in stats if stat.size_diff > 0)
+            return allocated, "\n".join(str(stat) for stat in stats[:self.top_n])
+
+        async def send_with_allocations(message):
+            nonlocal reported
+            if message["type"] == "http.response.start" and not reported:
+                reported = True
+                allocated, top_stats = await asyncio.to_thread(diff_allocations)
+                logger.info(
+                    "Allocations for %s %s (%d bytes):\n%s",
+                    scope["method"],
+                    scope["path"],
+                    allocated,
+                    top_stats
+                )
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (b"x-allocated-bytes", str(allocated).encode())]
+                }
+            await send(message)
+
+        try:
+            before = await asyncio.to_thread(tracemalloc.take_snapshot)
+            await self.app(scope, receive, send_with_allocations)
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+            self.lock.release()
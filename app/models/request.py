@@ -36,4 +36,11 @@ class SearchRequest(BaseRequest):
 class SummariseRequest(BaseRequest):
     content: str
     summary_length: Optional[str] = "medium"  # short, medium, long
-    summary_style: Optional[str] = "bullet_points"  # paragraph, bullet_points, key_points 
\ No newline at end of file
+    summary_style: Optional[str] = "bullet_points"  # paragraph, bullet_points, key_points 
+
+
+class JobRequest(BaseModel):
+    job_type: QueryType
+    llm_provider: LLMProvider = LLMProvider.OPENAI
+    items: List[Dict[str, Any]]  # each item holds the fields of the matching Chat/Search/Summarise request
+    use_batch_api: Optional[bool] = True
@@ -29,6 +29,7 @@ class SearchResponse(BaseResponse):
     total_results: int
     search_query: str
     summary: Optional[str] = None
+    usage_stats: Optional[Dict[str, Any]] = None
 
 
 class SummariseResponse(BaseResponse):
@@ -37,8 +38,22 @@ class SummariseResponse(BaseResponse):
     summary_length: int
     compression_ratio: Optional[float] = None
     key_points: Optional[List[str]] = None
+    usage_stats: Optional[Dict[str, Any]] = None
 
 
 class ErrorResponse(BaseResponse):
     error_code: str
-    error_details: Optional[Dict[str, Any]] = None 
\ No newline at end of file
+    error_details: Optional[Dict[str, Any]] = None 
+
+
+class JobResponse(BaseResponse):
+    job_id: str
+    status: str  # queued, running, completed, failed
+    job_type: str
+    mode: str  # batch, lane
+    total_items: int
+    completed_items: int = 0
+    failed_items: int = 0
+    created_at: datetime
+    updated_at: datetime
+    results_url: Optional[str] = None
@@ -1,9 +1,18 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import Union
-from app.models.request import ChatRequest, SearchRequest, SummariseRequest, BaseRequest
-from app.models.response import ChatResponse, SearchResponse, SummariseResponse, ErrorResponse
+import asyncio
+import threading
+from fastapi import APIRouter, Depends, Header, HTTPException, WebSocket, status
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from typing import Optional, Union
+from app.models.request import ChatRequest, SearchRequest, SummariseRequest, BaseRequest, JobRequest
+from app.models.response import ChatResponse, SearchResponse, SummariseResponse, ErrorResponse, JobResponse
 from app.controller import LLMController
 from app.utils.classifier import QueryClassifier
+from app.utils.speculation import SpeculativeRouter
+from app.jobs.manager import JobManager
+from app.middleware.admission import AdmissionController
+from app.ws.session import ChatSession, SessionRegistry
+from app.utils.admin import verify_admin_token
+from app.utils.profiling import SamplingProfiler, LoopBlockDetector
 
 # Initialize the router
 router = APIRouter()
@@ -11,6 +20,23 @@ router = APIRouter()
 # Initialize controller and classifier
 controller = LLMController()
 classifier = QueryClassifier()
+speculative_router = SpeculativeRouter(controller, classifier)
+job_manager = JobManager(controller)
+admission = AdmissionController(controller)
+ws_sessions = SessionRegistry()
+profiler = SamplingProfiler()
+loop_block_detector = LoopBlockDetector()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """
+    Dependency guarding admin endpoints with the ADMIN_TOKEN shared secret
+    """
+    if not verify_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Valid X-Admin-Token header required"
+        )
 
 
 @router.get("/health")
@@ -19,6 +45,14 @@ async def health_check():
     return {"status": "healthy", "service": "MCP-style AI Server"}
 
 
+@router.get("/health/load")
+async def load_metrics_endpoint():
+    """
+    Admission control state: event-loop lag, in-flight requests and rejections
+    """
+    return admission.get_metrics()
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_endpoint(request: ChatRequest) -> ChatResponse:
     """
@@ -70,25 +104,14 @@ async def auto_endpoint(request: BaseRequest) -> Union[ChatResponse, SearchRespo
     Auto-routing endpoint that classifies the query and routes to appropriate service
     """
     try:
-        # Classify the query
-        query_type = classifier.classify_query(request.query, request.context)
+        # Classify the query, matching the patterns only once
+        scores = classifier.get_pattern_scores(request.query)
+        query_type = classifier.classify_query(request.query, request.context, scores=scores)
         
-        # Route to appropriate endpoint based on classification
-        if query_type.value == "chat":
-            chat_request = ChatRequest(
-                query=request.query,
-                llm_provider=request.llm_provider,
-                context=request.context
-            )
-            return await controller.handle_chat(chat_request)
-            
-        elif query_type.value == "search":
-            search_request = SearchRequest(
-                query=request.query,
-                llm_provider=request.llm_provider,
-                context=request.context
-            )
-            return await controller.handle_search(search_request)
+        # Route to appropriate endpoint based on classification; chat and search
+        # may be run speculatively side by side when the classifier is unsure
+        if query_type.value in ("chat", "search"):
+            return await speculative_router.route(request, query_type, scores)
             
         elif query_type.value == "summarise":
             # For summarisation, we need content in context
@@ -122,14 +145,31 @@ async def auto_endpoint(request: BaseRequest) -> Union[ChatResponse, SearchRespo
         )
 
 
+@router.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket, device_id: Optional[str] = None):
+    """
+    Persistent session multiplexing chat, search and summarise operations by request id
+    """
+    await ws_sessions.serve(ChatSession(websocket, controller, admission, device_id=device_id))
+
+
+@router.get("/auto/metrics")
+async def auto_metrics_endpoint():
+    """
+    Speculative auto-routing counters, including how often speculation paid off
+    """
+    return speculative_router.get_metrics()
+
+
 @router.get("/classify")
 async def classify_endpoint(query: str):
     """
     Utility endpoint to test query classification
     """
     try:
-        query_type = classifier.classify_query(query)
-        confidence_scores = classifier.get_classification_confidence(query)
+        scores = classifier.get_pattern_scores(query)
+        query_type = classifier.classify_query(query, scores=scores)
+        confidence_scores = classifier.get_classification_confidence(query, scores=scores)
         
         return {
             "query": query,
@@ -140,4 +180,95 @@ async def classify_endpoint(query: str):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Classification failed: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+
+def _job_response(job) -> JobResponse:
+    return JobResponse(
+        success=job["status"] != "failed",
+        message=job.get("message"),
+        llm_provider=job["llm_provider"],
+        job_id=job["job_id"],
+        status=job["status"],
+        job_type=job["job_type"],
+        mode=job["mode"],
+        total_items=job["total_items"],
+        completed_items=job["completed_items"],
+        failed_items=job["failed_items"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        results_url=f"/api/v1/jobs/{job['job_id']}/results"
+    )
+
+
+@router.post("/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job_endpoint(request: JobRequest) -> JobResponse:
+    """
+    Submit a bulk job for background processing
+    """
+    try:
+        job = await job_manager.submit(request)
+        return _job_response(job)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid job: {str(e)}"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Job submission failed: {str(e)}"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def job_status_endpoint(job_id: str) -> JobResponse:
+    """
+    Get the status and progress of a bulk job
+    """
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}/results")
+async def job_results_endpoint(job_id: str):
+    """
+    Stream the finished results of a bulk job as newline-delimited JSON
+    """
+    if await asyncio.to_thread(job_manager.get, job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job not found: {job_id}"
+        )
+    return StreamingResponse(
+        job_manager.store.iter_results(job_id),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.get("/admin/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile_endpoint(seconds: float = 10.0, interval_ms: float = 5.0):
+    """
+    Sample the worker's event-loop thread and return folded stacks for flamegraph tools
+    """
+    if seconds <= 0 or interval_ms <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="seconds and interval_ms must be positive"
+        )
+
+    # This handler runs on the event-loop thread, which is the one to sample
+    loop_thread_id = threading.get_ident()
+    try:
+        folded = await asyncio.to_thread(profiler.profile, loop_thread_id, seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    return PlainTextResponse(folded)
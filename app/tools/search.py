@@ -1,5 +1,5 @@
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable
 import httpx
 
 
@@ -25,11 +25,23 @@ class WebSearchTool:
         ]
         return mock_results
     
-    async def search_with_summary(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+    async def search_with_summary(
+        self,
+        query: str,
+        max_results: int = 10,
+        prefetched: Optional[Awaitable[List[Dict[str, Any]]]] = None
+    ) -> Dict[str, Any]:
         """
         Perform search and generate summary of results
+
+        `prefetched` is an already-started search for the same query, e.g. one
+        kicked off eagerly by the auto-router, which is awaited instead of
+        issuing a second request.
         """
-        results = await self.search(query, max_results)
+        if prefetched is not None:
+            results = (await prefetched)[:max_results]
+        else:
+            results = await self.search(query, max_results)
         
         # TODO: Implement actual summarization of search results
         summary = f"Found {len(results)} results for '{query}'. The top results discuss various aspects of the topic."
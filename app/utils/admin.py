@@ -0,0 +1,13 @@
+import hmac
+import os
+from typing import Optional
+
+
+def verify_admin_token(token: Optional[str]) -> bool:
+    """
+    Check a token against ADMIN_TOKEN; admin features are disabled when it is unset
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token or not token:
+        return False
+    return hmac.compare_digest(token.encode(), admin_token.encode())
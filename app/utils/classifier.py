@@ -24,27 +24,24 @@ class QueryClassifier:
             r'\b(tldr|tl;dr|in short|briefly)\b'
         ]
     
-    def classify_query(self, query: str, context: Optional[Dict[str, Any]] = None) -> QueryType:
+    def classify_query(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None,
+        scores: Optional[Dict[QueryType, int]] = None
+    ) -> QueryType:
         """
         Classify the query to determine the appropriate endpoint
+
+        `scores` may be passed in from get_pattern_scores to avoid matching twice.
         """
-        query_lower = query.lower()
-        
         # Check for explicit content to summarise
         if context and "content" in context:
             return QueryType.SUMMARISE
         
         # Count pattern matches for each type
-        search_score = sum(1 for pattern in self.search_patterns if re.search(pattern, query_lower))
-        chat_score = sum(1 for pattern in self.chat_patterns if re.search(pattern, query_lower))
-        summarise_score = sum(1 for pattern in self.summarise_patterns if re.search(pattern, query_lower))
-        
-        # Return the type with highest score
-        scores = {
-            QueryType.SEARCH: search_score,
-            QueryType.CHAT: chat_score,
-            QueryType.SUMMARISE: summarise_score
-        }
+        if scores is None:
+            scores = self.get_pattern_scores(query)
         
         # If no clear winner, default to chat
         max_score = max(scores.values())
@@ -58,15 +55,32 @@ class QueryClassifier:
         
         return QueryType.CHAT
     
-    def get_classification_confidence(self, query: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
+    def get_pattern_scores(self, query: str) -> Dict[QueryType, int]:
         """
-        Get confidence scores for each classification type
+        Get the raw number of matching patterns for each classification type
         """
         query_lower = query.lower()
         
-        search_score = sum(1 for pattern in self.search_patterns if re.search(pattern, query_lower))
-        chat_score = sum(1 for pattern in self.chat_patterns if re.search(pattern, query_lower))
-        summarise_score = sum(1 for pattern in self.summarise_patterns if re.search(pattern, query_lower))
+        return {
+            QueryType.SEARCH: sum(1 for pattern in self.search_patterns if re.search(pattern, query_lower)),
+            QueryType.CHAT: sum(1 for pattern in self.chat_patterns if re.search(pattern, query_lower)),
+            QueryType.SUMMARISE: sum(1 for pattern in self.summarise_patterns if re.search(pattern, query_lower))
+        }
+    
+    def get_classification_confidence(
+        self,
+        query: str,
+        context: Optional[Dict[str, Any]] = None,
+        scores: Optional[Dict[QueryType, int]] = None
+    ) -> Dict[str, float]:
+        """
+        Get confidence scores for each classification type
+        """
+        if scores is None:
+            scores = self.get_pattern_scores(query)
+        search_score = scores[QueryType.SEARCH]
+        chat_score = scores[QueryType.CHAT]
+        summarise_score = scores[QueryType.SUMMARISE]
         
         total_score = search_score + chat_score + summarise_score
         
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Time-bounded sampling CPU profiler for the event-loop thread.
+
+    A helper thread periodically reads the target thread's current stack and
+    counts identical stacks, producing collapsed ("folded") stack output that
+    flamegraph.pl, speedscope and similar tools read directly.
+    """
+
+    def __init__(self):
+        self.max_seconds = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+        self.lock = threading.Lock()
+
+    def profile(self, thread_id: int, seconds: float, interval: float) -> str:
+        """
+        Sample `thread_id` for `seconds` and return folded stacks, one per line
+        """
+        if not self.lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+
+        try:
+            stacks = Counter()
+            deadline = time.monotonic() + min(seconds, self.max_seconds)
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is not None:
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    stacks[";".join(reversed(labels))] += 1
+                time.sleep(interval)
+        finally:
+            self.lock.release()
+
+        return "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+
+
+class LoopBlockDetector:
+    """
+    Logs the event-loop stack whenever a callback blocks the loop too long.
+
+    A task on the loop records a heartbeat every few milliseconds and a
+    watchdog thread checks it. If the heartbeat stalls past the threshold, the
+    watchdog captures the loop thread's stack while it is still blocked, so the
+    log shows the code responsible rather than just the delay.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv("SLOW_CALLBACK_DETECTOR_ENABLED", "true").lower() == "true"
+        self.threshold = float(os.getenv("SLOW_CALLBACK_THRESHOLD_MS", "100")) / 1000
+        self.tick_interval = self.threshold / 4
+        self.last_tick = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.heartbeat: Optional[asyncio.Task] = None
+        self.watchdog: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+
+    def start(self) -> None:
+        """
+        Start monitoring; must be called from the event-loop thread
+        """
+        if not self.enabled or self.heartbeat is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.last_tick = time.monotonic()
+        self.stopped.clear()
+        self.heartbeat = asyncio.create_task(self._heartbeat())
+        self.watchdog = threading.Thread(target=self._watch, name="loop-block-detector", daemon=True)
+        self.watchdog.start()
+
+    async def stop(self) -> None:
+        if self.heartbeat is None:
+            return
+        self.stopped.set()
+        self.heartbeat.cancel()
+        await asyncio.gather(self.heartbeat, return_exceptions=True)
+        self.heartbeat = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self.last_tick = time.monotonic()
+            await asyncio.sleep(self.tick_interval)
+
+    def _watch(self) -> None:
+        reported = False
+        while not self.stopped.wait(self.tick_interval):
+            blocked_for = time.monotonic() - self.last_tick - self.tick_interval
+            if blocked_for < self.threshold:
+                reported = False
+                continue
+            if reported:
+                continue
+
+            # Report each stall once, with the stack captured while it is happening
+            reported = True
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>"
+            logger.warning(
+                "Event loop blocked for at least %.0f ms; loop thread stack:\n%s",
+                blocked_for * 1000,
+                stack
+            )
@@ -0,0 +1,136 @@
+import asyncio
+import os
+from typing import Dict, Any, Optional, Union
+from app.models.request import QueryType, BaseRequest, ChatRequest, SearchRequest
+from app.models.response import ChatResponse, SearchResponse
+
+
+class SpeculativeRouter:
+    """
+    Routes /auto chat and search queries, speculating when the classifier is unsure.
+
+    When the classifier picks search with a confidence below the threshold and
+    chat also matched some patterns, both paths are started concurrently. Search
+    wins unless it fails or comes back empty, in which case the already-running
+    chat is used instead of a serial retry, and the loser is cancelled. A
+    chat-primary pick is never speculated: chat rarely fails, so the concurrent
+    search and its summary call would almost always be wasted. When speculating,
+    the web search is started before either path builds its request, so it
+    overlaps with the chat path's setup; a plain search gains nothing from an
+    early start and runs normally.
+    """
+
+    def __init__(self, controller, classifier):
+        self.controller = controller
+        self.classifier = classifier
+        self.enabled = os.getenv("AUTO_SPECULATION_ENABLED", "true").lower() == "true"
+        self.threshold = float(os.getenv("AUTO_SPECULATION_THRESHOLD", "0.6"))
+        # Cost cap: at most this many requests may run a second provider path at once
+        self.max_in_flight = int(os.getenv("AUTO_SPECULATION_MAX_IN_FLIGHT", "4"))
+        self.in_flight = 0
+        self.metrics = {
+            "routed": 0,
+            "speculated": 0,
+            "primary_won": 0,
+            "alternative_won": 0,
+            "losers_cancelled": 0,
+            "skipped_cost_cap": 0
+        }
+
+    async def route(
+        self,
+        request: BaseRequest,
+        query_type: QueryType,
+        scores: Dict[QueryType, int]
+    ) -> Union[ChatResponse, SearchResponse]:
+        """
+        Run the chat or search path for an auto-routed request, given the
+        classifier's pattern scores already computed for it
+        """
+        self.metrics["routed"] += 1
+        alternative = QueryType.SEARCH if query_type == QueryType.CHAT else QueryType.CHAT
+        confidence = self.classifier.get_classification_confidence(request.query, request.context, scores=scores)
+
+        # Only speculate when the alternative actually matched; an unmatched
+        # query gets a flat default confidence that would otherwise always qualify.
+        # Only search has a cheap mis-route signal (no results), so chat never speculates
+        speculate = (
+            self.enabled
+            and query_type == QueryType.SEARCH
+            and confidence[query_type] < self.threshold
+            and scores[alternative] > 0
+        )
+        if speculate and self.in_flight >= self.max_in_flight:
+            self.metrics["skipped_cost_cap"] += 1
+            speculate = False
+
+        if not speculate:
+            return await self._run(query_type, request, None)
+
+        self.metrics["speculated"] += 1
+        self.in_flight += 1
+        search_task = asyncio.create_task(
+            self.controller.search_tool.search(request.query, SearchRequest.model_fields["max_results"].default)
+        )
+        tasks = {
+            path: asyncio.create_task(self._run(path, request, search_task))
+            for path in (query_type, alternative)
+        }
+        try:
+            primary = await tasks[query_type]
+            if self._is_usable(primary):
+                self.metrics["primary_won"] += 1
+                return primary
+
+            fallback = await tasks[alternative]
+            if self._is_usable(fallback):
+                self.metrics["alternative_won"] += 1
+                return fallback
+            return primary
+        finally:
+            self.in_flight -= 1
+            for task in tasks.values():
+                if not task.done():
+                    task.cancel()
+                    self.metrics["losers_cancelled"] += 1
+            if not search_task.done():
+                search_task.cancel()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        speculated = self.metrics["speculated"]
+        return {
+            **self.metrics,
+            "in_flight": self.in_flight,
+            "payoff_rate": self.metrics["alternative_won"] / speculated if speculated else 0.0
+        }
+
+    async def _run(
+        self,
+        query_type: QueryType,
+        request: BaseRequest,
+        search_task: Optional[asyncio.Task]
+    ) -> Union[ChatResponse, SearchResponse]:
+        if query_type == QueryType.SEARCH:
+            search_request = SearchRequest(
+                query=request.query,
+                llm_provider=request.llm_provider,
+                context=request.context
+            )
+            return await self.controller.handle_search(search_request, prefetched_results=search_task)
+
+        chat_request = ChatRequest(
+            query=request.query,
+            llm_provider=request.llm_provider,
+            context=request.context
+        )
+        return await self.controller.handle_chat(chat_request)
+
+    def _is_usable(self, response: Union[ChatResponse, SearchResponse]) -> bool:
+        """
+        Cheap winner rule: a path wins if it succeeded and, for search, found something
+        """
+        if not response.success:
+            return False
+        if isinstance(response, SearchResponse):
+            return response.total_results > 0
+        return True
@@ -0,0 +1 @@
+# WebSocket sessions package
\ No newline at end of file
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional, Union
+from fastapi import WebSocket, WebSocketDisconnect
+from app.models.request import ChatRequest, SearchRequest, SummariseRequest
+
+# HTTP route whose admission priority each operation shares
+OPERATION_ROUTES = {
+    "chat": "/api/v1/chat",
+    "search": "/api/v1/search",
+    "summarise": "/api/v1/summarise"
+}
+
+
+class ChatSession:
+    """
+    One persistent WebSocket session for a device.
+
+    Client messages are JSON objects with a `type` and, for operations, a
+    client-chosen string or integer `id`:
+      {"type": "chat" | "search" | "summarise", "id": "...", "payload": {...}}
+      {"type": "cancel", "id": "..."}
+      {"type": "reset"} clears the conversation history
+      {"type": "pong"} answers a server heartbeat
+    Operations run concurrently and every server message carries the `id` it
+    belongs to: `token` deltas while a chat streams, then a `result`, `error`
+    or `cancelled`. Outgoing messages go through a bounded queue, so a slow
+    client pauses token generation instead of growing server memory. Each
+    operation is admitted like its HTTP counterpart, so overload sheds socket
+    traffic with the same per-route priorities.
+    """
+
+    def __init__(self, websocket: WebSocket, controller, admission, device_id: Optional[str] = None):
+        self.websocket = websocket
+        self.controller = controller
+        self.admission = admission
+        self.device_id = device_id
+        self.heartbeat_interval = float(os.getenv("WS_HEARTBEAT_SECONDS", "20"))
+        self.max_operations = int(os.getenv("WS_MAX_CONCURRENT_OPERATIONS", "4"))
+        self.max_history = int(os.getenv("WS_MAX_HISTORY_MESSAGES", "50"))
+
+        self.conversation_history: List[Dict[str, str]] = []
+        self.operations: Dict[Union[str, int], asyncio.Task] = {}
+        self.outbox: asyncio.Queue = asyncio.Queue(maxsize=int(os.getenv("WS_SEND_QUEUE_SIZE", "256")))
+        self.last_seen = time.monotonic()
+
+    async def run(self) -> None:
+        """
+        Serve the socket until the client disconnects or stops answering heartbeats
+        """
+        await self.websocket.accept()
+        sender = asyncio.create_task(self._send_loop())
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while True:
+                frame = await self.websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    break
+                self.last_seen = time.monotonic()
+                # Binary frames are valid WebSocket input; both carry the same JSON
+                data = frame.get("text")
+                await self._dispatch(data if data is not None else frame.get("bytes") or b"")
+        except WebSocketDisconnect:
+            pass
+        finally:
+            for task in [*self.operations.values(), sender, heartbeat]:
+                task.cancel()
+            await asyncio.gather(*self.operations.values(), sender, heartbeat, return_exceptions=True)
+
+    async def close(self, code: int = 1000) -> None:
+        try:
+            await self.websocket.close(code=code)
+        except RuntimeError:
+            # Already closed
+            pass
+
+    async def _dispatch(self, data: Union[str, bytes]) -> None:
+        try:
+            message = json.loads(data)
+            message_type = message["type"]
+        except (ValueError, KeyError, TypeError):
+            await self._send({"type": "error", "id": None, "detail": "Invalid message"})
+            return
+
+        request_id = message.get("id")
+        if message_type == "pong":
+            return
+        if message_type == "ping":
+            await self._send({"type": "pong"})
+        elif message_type == "reset":
+            self.conversation_history = []
+        elif message_type in ("cancel", "chat", "search", "summarise") and not self._valid_id(request_id):
+            await self._send({"type": "error", "id": None, "detail": "Operation id must be a string or integer"})
+        elif message_type == "cancel":
+            task = self.operations.get(request_id)
+            if task is not None:
+                task.cancel()
+        elif message_type in ("chat", "search", "summarise"):
+            payload = message.get("payload") or {}
+            if request_id in self.operations:
+                await self._send({"type": "error", "id": request_id, "detail": "Operation id already in use"})
+            elif not isinstance(payload, dict):
+                await self._send({"type": "error", "id": request_id, "detail": "Operation payload must be an object"})
+            elif len(self.operations) >= self.max_operations:
+                await self._send({"type": "error", "id": request_id, "detail": "Too many operations in flight"})
+            else:
+                self.operations[request_id] = asyncio.create_task(
+                    self._run_operation(message_type, request_id, payload)
+                )
+        else:
+            await self._send({"type": "error", "id": request_id, "detail": f"Unknown message type: {message_type}"})
+
+    def _valid_id(self, request_id: Any) -> bool:
+        # bool is an int subclass but never a meaningful id
+        return isinstance(request_id, (str, int)) and not isinstance(request_id, bool)
+
+    async def _run_operation(self, operation: str, request_id: Union[str, int], payload: Dict[str, Any]) -> None:
+        route, priority = self.admission.classify_route(OPERATION_ROUTES[operation])
+        try:
+            reason = await self.admission.admit(route, priority)
+        except asyncio.CancelledError:
+            # Cancelled while queued for admission; no slot was taken
+            self.operations.pop(request_id, None)
+            self._notify_cancelled(request_id)
+            raise
+        if reason is not None:
+            self.operations.pop(request_id, None)
+            await self._send({
+                "type": "error",
+                "id": request_id,
+                "detail": f"Server overloaded ({reason}), retry later",
+                "retry_after": self.admission.retry_after
+            })
+            return
+
+        try:
+            if operation == "chat":
+                response = await self._chat(request_id, payload)
+            elif operation == "search":
+                response = await self.controller.handle_search(SearchRequest(**payload))
+            else:
+                response = await self.controller.handle_summarise(SummariseRequest(**payload))
+            await self._send({"type": "result", "id": request_id, "data": response.model_dump(mode="json")})
+        except asyncio.CancelledError:
+            self._notify_cancelled(request_id)
+        except (ValueError, TypeError) as e:
+            await self._send({"type": "error", "id": request_id, "detail": f"Invalid {operation} request: {str(e)}"})
+        finally:
+            self.operations.pop(request_id, None)
+            await self.admission.release(route)
+
+    async def _chat(self, request_id: Union[str, int], payload: Dict[str, Any]):
+        request = ChatRequest(**payload)
+        if request.conversation_history is None:
+            request.conversation_history = list(self.conversation_history)
+
+        async def on_token(delta: str) -> None:
+            await self._send({"type": "token", "id": request_id, "delta": delta})
+
+        response = await self.controller.handle_chat_stream(request, on_token)
+        if response.success:
+            self.conversation_history.extend([
+                {"role": "user", "content": request.query},
+                {"role": "assistant", "content": response.response}
+            ])
+            del self.conversation_history[:-self.max_history]
+        return response
+
+    def _notify_cancelled(self, request_id: Union[str, int]) -> None:
+        # Best effort: the session may be shutting down with a full outbox
+        try:
+            self.outbox.put_nowait({"type": "cancelled", "id": request_id})
+        except asyncio.QueueFull:
+            pass
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        # Blocks when the outbox is full, which is what applies backpressure
+        await self.outbox.put(message)
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self.outbox.get()
+            await self.websocket.send_json(message)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if time.monotonic() - self.last_seen > self.heartbeat_interval * 2:
+                await self.close(code=1001)
+                return
+            await self._send({"type": "ping"})
+
+
+class SessionRegistry:
+    """
+    Tracks live sessions so each device holds at most one socket
+    """
+
+    def __init__(self):
+        self.sessions: Dict[str, ChatSession] = {}
+
+    async def serve(self, session: ChatSession) -> None:
+        device_id = session.device_id
+        if device_id is not None:
+            previous = self.sessions.get(device_id)
+            self.sessions[device_id] = session
+            if previous is not None:
+                # Replaced by a newer connection from the same device
+                await previous.close(code=4000)
+
+        try:
+            await session.run()
+        finally:
+            if device_id is not None and self.sessions.get(device_id) is session:
+                del self.sessions[device_id]